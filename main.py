@@ -34,42 +34,49 @@ Setup:
    python merged_buddy.py generate-doc --source ./my-project --title "My Project Documentation"
 """
 
+import sys
+from importlib.metadata import PackageNotFoundError, version as _package_version
+
+try:
+    __version__ = _package_version("classroom-automation")
+except PackageNotFoundError: # Running from a checkout that isn't pip-installed
+    __version__ = "0.1.0"
+
+# Fast path: answer a bare --version before importing typer, rich and the Google SDKs
+if __name__ == "__main__" and sys.argv[1:] in (["--version"], ["-V"]):
+    sys.stdout.write(f"genie-us {__version__}\n")
+    sys.exit(0)
+
 import os
-import pickle
+import hashlib
+import json
 import re
 import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Tuple, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Dict, Tuple, Optional
 import typer
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
 from rich.status import Status
+from rich.live import Live
 from rich.markdown import Markdown
 
 # Google API Imports
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+# (the client, auth and transport libraries are imported where they are used, so
+#  commands that never talk to Google, and --help, don't pay for them)
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
+if TYPE_CHECKING:
+    from googleapiclient.http import MediaIoBaseUpload
 
 # Text & AI Imports
-import google.generativeai as genai
+# (google.generativeai, pdfplumber and gTTS are slow to import, so they are
+#  imported where they are used rather than on every CLI invocation)
 from dotenv import load_dotenv
-import pdfplumber
-from gtts import gTTS
-
-# --- NEW: Import for Docx Generation ---
-try:
-    from docx import Document
-    from docx.shared import Pt
-    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-# ------------------------------------
 
 # ---------------------- Setup ----------------------
 app = typer.Typer(help="A Google Classroom CLI tool to detect materials, analyze announcements, and generate study aids with Gemini AI.")
@@ -86,6 +93,67 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive.file'                            # For Study Buddy
 ]
 
+# Upper bound on simultaneous Gemini requests (keeps us under the per-minute quota)
+GEMINI_MAX_CONCURRENCY = 4
+
+# Gemini model used for every generation
+GEMINI_MODEL = 'gemini-2.5-flash'
+
+# Gemini models shared by every ClassroomBuddyCLI in the process, keyed by system instruction
+_gemini_models: Dict[Optional[str], object] = {}
+_gemini_models_lock = threading.Lock()
+
+def _get_gemini_model(system_instruction: Optional[str] = None):
+    """
+    Returns the shared Gemini model for a system instruction, configuring the SDK
+    and creating the model only the first time it is needed.
+    """
+    with _gemini_models_lock:
+        model = _gemini_models.get(system_instruction)
+        if model is None:
+            import google.generativeai as genai
+            if not _gemini_models: # First model in this process
+                genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+            model = genai.GenerativeModel(GEMINI_MODEL, system_instruction=system_instruction)
+            _gemini_models[system_instruction] = model
+        return model
+
+# Maximum number of calls Google accepts in a single batch HTTP request
+BATCH_MAX_REQUESTS = 50
+
+# Socket timeout (seconds) for Google API connections, so a stalled request fails instead of hanging
+HTTP_TIMEOUT = 60
+
+# Retries (with exponential backoff) for Google API calls that fail with 429/5xx
+API_NUM_RETRIES = 5
+
+# Number of attachments downloaded in parallel for a single material
+DRIVE_DOWNLOAD_WORKERS = 4
+
+# Uploads larger than this use the resumable protocol; smaller ones go up in one request
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+
+# Chunk size for resumable uploads (must be a multiple of 256 KiB)
+RESUMABLE_UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Local cache for artifacts that are expensive to rebuild (text extracted from PDFs, Gemini responses)
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'genie-us')
+
+# Cached Gemini responses and extracted texts unused for this many days are deleted
+CACHE_MAX_AGE_DAYS = 30
+
+# Newest announcement seen per course, so --new-only runs skip what was already shown
+ANNOUNCEMENT_WATERMARKS_FILE = os.path.join(CACHE_DIR, 'announcement_watermarks.json')
+
+# Partial response for material listings: skip descriptions and other unused fields
+MATERIAL_LIST_FIELDS = 'nextPageToken,courseWorkMaterial(id,title,updateTime,materials)'
+
+# Partial response for announcement listings: only the text and update time are used
+ANNOUNCEMENT_LIST_FIELDS = 'nextPageToken,announcements(updateTime,text)'
+
+# Drive metadata we need to read an attachment and key its cached text
+DRIVE_METADATA_FIELDS = 'mimeType, name, modifiedTime'
+
 # --- Keywords from Monitor Script ---
 PROJECT_KEYWORDS = [
     'synopsis', 'project', 'pbl', 'problem-based learning', 'problem based learning',
@@ -100,29 +168,172 @@ LAB_TEST_KEYWORDS = [
     'midterm', 'final exam', 'coding test', 'assessment', 'lab evaluation'
 ]
 
+# All keywords as one whole-word alternation so a text is scanned once. The match
+# sits in a lookahead so overlapping keywords ("mini project" and "project") are
+# all found; longest first so a keyword never shadows a longer one at the same spot.
+KEYWORD_PATTERN = re.compile(
+    r'(?=\b(' + '|'.join(
+        re.escape(keyword) for keyword in sorted(PROJECT_KEYWORDS + LAB_TEST_KEYWORDS, key=len, reverse=True)
+    ) + r')\b)',
+    re.IGNORECASE
+)
+
+# Characters we strip/replace when building filenames
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\-_\. ]')
+
+# Printed between generated results in detect-announcements
+SECTION_SEPARATOR = "\n" + "=" * 80 + "\n"
+
+# --- Gemini system instructions ---
+# The fixed part of each announcement prompt. Sent as the model's system
+# instruction so every request shares the same prefix and only the course
+# and announcement text vary per call.
+ANNOUNCEMENT_SUMMARY_INSTRUCTION = """\
+You are a helpful assistant summarizing all recent announcements for a course.
+
+Provide a **very short, high-level summary** in bullet points (3-5 points maximum).
+Focus *only* on the most critical information:
+- **Key deadlines**
+- **Required actions** (e.g., "Submit X," "Prepare for Y")
+- **Main topics** (e.g., "Project synopsis guidelines released")
+
+Be as brief as possible. Do not use bold text.
+"""
+
+PROJECT_IDEAS_INSTRUCTION = """\
+You are an expert educational advisor analyzing a project announcement and generating tailored project ideas.
+
+Your task:
+Be detailed but concise. Use bullet points heavily.
+
+1. CAREFULLY READ and ANALYZE the announcement to understand:
+   - Specific requirements and constraints
+   - Topics or domains mentioned
+   - Technologies or tools specified
+   - Learning objectives
+   - Deliverables expected
+   - Any deadlines or milestones
+   - Team size or collaboration requirements
+   - Evaluation criteria
+
+2. Generate 5-7 TAILORED PROJECT IDEAS that:
+   - DIRECTLY match the announcement specifications
+   - Address the stated requirements
+   - Are feasible within the given constraints
+   - Align with the course subject and level
+   - Incorporate mentioned technologies/tools
+
+3. For EACH project idea provide:
+   - **Project Title**: Clear, descriptive name
+   - **Description**: 2-3 sentences explaining the project
+   - **How it meets requirements**: Explicitly state which announcement requirements it fulfills
+   - **Key Technologies/Tools**: Specific tech stack
+   - **Implementation Steps**: 4-6 high-level steps
+   - **Expected Outcomes**: What students will learn/achieve
+   - **Complexity Level**: Beginner/Intermediate/Advanced
+
+4. RESOURCES & REFERENCES:
+   - Provide 5-8 specific resources for EACH major technology/tool mentioned
+   - Include actual GitHub repository search terms (e.g., "search GitHub for: 'student management system python django'")
+   - List relevant tutorial websites with search queries
+   - Suggest YouTube channels or specific video searches
+   - Recommend documentation links (provide exact URLs where possible)
+   - Mention similar projects on platforms like:
+     * GitHub (provide search terms)
+     * Kaggle (for data science projects)
+     * CodePen/JSFiddle (for web projects)
+     * Instructables (for hardware projects)
+
+5. EXAMPLE PROJECT LINKS & SEARCH STRATEGIES:
+   - Provide specific GitHub search queries that will find similar completed projects
+   - Format: "GitHub Search: [exact search term]"
+   - Example: "GitHub Search: 'e-commerce website react node mongodb'"
+   - Include alternative search terms for different platforms
+
+Format your response clearly with:
+- Main headers (##)
+- Subheaders (###)
+- Bullet points for lists
+- Code blocks for search terms or commands
+- Bold for emphasis
+
+Be SPECIFIC, PRACTICAL, and ensure all ideas are directly relevant to the announcement content.
+"""
+
+PRACTICE_QUESTIONS_INSTRUCTION = """\
+You are an expert Computer Science professor creating a practice test.
+
+Your task:
+Be concise and clear.
+
+1. CAREFULLY READ and ANALYZE the announcement to identify:
+   - The key topics or concepts to be tested (e.g., "Data Structures," "Algorithms," "Database Queries," "Python Basics").
+   - The format of the test (e.g., coding questions, viva, multiple choice).
+   - Any specific technologies or languages mentioned.
+
+2. Generate 5-7 TAILORED PRACTICE QUESTIONS that:
+   - DIRECTLY relate to the topics in the announcement.
+   - Are at an appropriate difficulty level for a university course.
+   - Mimic the likely format of the test (focus on coding problems if it's a "lab test").
+
+3. For EACH practice question, provide:
+   - **Question Title/Topic**: (e.g., "Array Manipulation," "SQL Join," "Binary Tree Traversal")
+   - **Problem Statement**: A clear, concise problem.
+   - **Example Input/Output**: (if applicable)
+   - **Key Concepts to Apply**: What the student needs to know to solve it.
+   - **Hint**: (Optional) A small hint to guide the student.
+
+4. Provide a "Study Guide & Resources" section:
+   - List the 3-5 most important topics to review.
+   - Provide 5-8 specific resources (documentation links, tutorials, YouTube video searches) to help students prepare for these topics.
+   - Format: "Search YouTube for: 'Data Structures in Python full course'"
+   - Format: "Read documentation: 'Python 'list' methods'"
+
+Format your response clearly using Markdown (headers, subheaders, bullet points, and code blocks for code).
+Be SPECIFIC, PRACTICAL, and ensure all questions are directly relevant to the announcement content.
+"""
+
 # ---------------------- Core Class (Merged) ----------------------
 class ClassroomBuddyCLI:
-    def __init__(self, credentials_file='credentials.json', token_file='token.pickle'):
+    def __init__(self, credentials_file='credentials.json', token_file='token.json', authenticate=True,
+                 use_cache=True):
+        """
+        Set `authenticate=False` for Gemini-only use: no Google sign-in happens and
+        the Classroom/Drive services stay unset. Set `use_cache=False` to always
+        call Gemini instead of reusing cached responses (new responses are still
+        cached for later runs).
+        """
         self.credentials_file = credentials_file
         self.token_file = token_file
+        self.use_cache = use_cache
         self.creds = None
         self.classroom_service = None # For Classroom API
         self.drive_service = None     # For Drive API
         self.gemini_model = None
-        self._authenticate()
+        self._gemini_semaphore = threading.Semaphore(GEMINI_MAX_CONCURRENCY)
+        self._local = threading.local() # Per-thread HTTP transports
+        if authenticate:
+            self._authenticate()
         self._setup_gemini()
 
     def _authenticate(self):
         """Authenticate with Google APIs (Classroom & Drive)."""
+        from google.oauth2.credentials import Credentials
+        from googleapiclient.discovery import build
+
         creds = None
         if os.path.exists(self.token_file):
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
+            try:
+                creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+            except ValueError:
+                # Unreadable or old pickle-format token; fall through to re-authentication
+                console.print("[yellow]Ignoring unreadable token file, re-authenticating...[/yellow]")
 
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 console.print("[yellow]Refreshing expired credentials...[/yellow]")
                 try:
+                    from google.auth.transport.requests import Request
                     creds.refresh(Request())
                 except Exception as e:
                     console.print(f"[red]Error refreshing token: {e}[/red]")
@@ -138,18 +349,27 @@ class ClassroomBuddyCLI:
                         "Download it from Google Cloud Console."
                     )
                 console.print("[cyan]Authenticating with Google...[/cyan]")
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, SCOPES)
                 creds = flow.run_local_server(port=0)
 
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            # Only reached after a refresh or a new sign-in. Written via a temp file so an
+            # interrupted run can't leave a truncated token behind.
+            tmp_token_file = f"{self.token_file}.tmp"
+            with open(tmp_token_file, 'w', encoding='utf-8') as token:
+                token.write(creds.to_json())
+            os.replace(tmp_token_file, self.token_file)
             console.print("[green]✓ Authentication successful![/green]")
 
         self.creds = creds
         try:
-            # Build BOTH services
-            self.classroom_service = build('classroom', 'v1', credentials=creds)
-            self.drive_service = build('drive', 'v3', credentials=creds)
+            # Build BOTH services on one shared authorized transport so keep-alive
+            # connections are reused across calls instead of each client owning its own.
+            # The discovery documents ship with the client library, so skip the file cache.
+            http = self._new_http()
+            self._local.http = http # The main thread's transport (see _thread_http)
+            self.classroom_service = build('classroom', 'v1', http=http, cache_discovery=False)
+            self.drive_service = build('drive', 'v3', http=http, cache_discovery=False)
             console.print("[green]✓ Classroom and Drive services initialized.[/green]")
         except HttpError as e:
             console.print(f"[red]Error building services: {e}[/red]")
@@ -160,18 +380,134 @@ class ClassroomBuddyCLI:
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
             raise ValueError("Missing GEMINI_API_KEY in environment variables (.env file).")
-        genai.configure(api_key=api_key)
-        self.gemini_model = genai.GenerativeModel('gemini-2.5-flash')
+        self.gemini_model = _get_gemini_model()
         console.print("[green]✓ Gemini AI configured![/green]")
 
-    def _parse_timestamp(self, ts: str):
-        """Parses Google API timestamp to a comparable datetime object."""
+    def _model_for(self, system_instruction: Optional[str]):
+        """The Gemini model to use for a system instruction (see _get_gemini_model)."""
+        if system_instruction is None:
+            return self.gemini_model
+        return _get_gemini_model(system_instruction)
+
+    def _generate_text(self, prompt: str, on_update: Optional[Callable[[str], None]] = None,
+                       system_instruction: Optional[str] = None) -> str:
+        """
+        Run a Gemini request and return the response text, limiting how many run
+        at once across threads. If `on_update` is given the response is streamed
+        and `on_update` is called with the text received so far after each chunk.
+        Responses are cached on disk by prompt; with caching disabled the cache is
+        not read, but the fresh response still replaces the cached one.
+        """
+        model = self._model_for(system_instruction)
+        cache_key = prompt if system_instruction is None else f"{system_instruction}\n{prompt}"
+        cache_path = self._gemini_cache_path(cache_key)
+        cached = self._read_gemini_cache(cache_path) if self.use_cache else None
+        if cached is not None:
+            if on_update is not None:
+                on_update(cached)
+            return cached
+
+        with self._gemini_semaphore:
+            if on_update is None:
+                text = model.generate_content(prompt).text.strip()
+            else:
+                parts = []
+                for chunk in model.generate_content(prompt, stream=True):
+                    if chunk.parts: # The final chunk may carry only finish metadata
+                        parts.append(chunk.text)
+                        on_update("".join(parts))
+                if not parts:
+                    # e.g. a blocked candidate; fail like .text does on the non-streaming path
+                    raise ValueError("Gemini returned no text for this prompt.")
+                text = "".join(parts).strip()
+
+        if text: # Never cache an empty response; it would be served on every later run
+            self._write_cache(cache_path, json.dumps({'text': text}))
+        return text
+
+    def _gemini_cache_path(self, prompt: str) -> str:
+        """Cache location for a prompt; the model name is part of the key."""
+        key = hashlib.sha256(f"{GEMINI_MODEL}\n{prompt}".encode('utf-8')).hexdigest()
+        return os.path.join(CACHE_DIR, 'gemini', f"{key}.json")
+
+    def _read_gemini_cache(self, cache_path: str) -> Optional[str]:
+        """Cached response text, or None on a miss (or an unreadable or empty entry)."""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                text = json.load(f)['text'] or None
+        except (OSError, ValueError, KeyError):
+            return None
+        if text:
+            self._touch_cache(cache_path)
+        return text
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_timestamp(ts: str):
+        """
+        Parses Google API timestamp to a comparable datetime object.
+        Cached since the same update times are parsed for filtering and again for display.
+        """
         if not ts:
             return datetime.min.replace(tzinfo=timezone.utc)
-        # Handle nanoseconds and 'Z'
-        if '.' in ts:
-            ts = ts.split('.')[0] + 'Z'
-        return datetime.strptime(ts, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+        # Timestamps are always UTC 'YYYY-MM-DDTHH:MM:SS[.fraction]Z'; drop the fraction and 'Z'
+        return datetime.fromisoformat(ts[:19]).replace(tzinfo=timezone.utc)
+
+    @staticmethod
+    def _timestamp_key(ts: str) -> str:
+        """
+        Full-precision sort key for a Google API timestamp. The fraction is padded to
+        nanoseconds so '...:00Z' and '...:00.1Z' order correctly as plain strings.
+        """
+        if not ts:
+            return ''
+        fraction = ts[20:-1] if ts[19:20] == '.' else ''
+        return f"{ts[:19]}.{fraction.ljust(9, '0')}"
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_timestamp(ts: str) -> str:
+        """Display form of a Google API timestamp; each announcement's is shown more than once."""
+        return ClassroomBuddyCLI._parse_timestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+    def _execute_batch(self, service, requests: Dict[str, object]) -> Dict[str, Optional[Dict]]:
+        """
+        Execute many API requests using as few HTTP round-trips as possible.
+        Returns {request_id: response}; requests that failed map to None, and
+        callers refetch those individually (with retries).
+        """
+        results = {}
+
+        def callback(request_id, response, exception):
+            if exception is not None:
+                console.print(f"[red]⚠️ Batched request {request_id} failed:[/red] {exception}")
+                response = None
+            results[request_id] = response
+
+        items = list(requests.items())
+        for start in range(0, len(items), BATCH_MAX_REQUESTS):
+            batch = service.new_batch_http_request(callback=callback)
+            for request_id, request in items[start:start + BATCH_MAX_REQUESTS]:
+                batch.add(request, request_id=request_id)
+            batch.execute()
+        return results
+
+    def _thread_http(self):
+        """
+        Authorized HTTP transport for the calling thread. httplib2 connections are
+        not thread-safe, so each worker thread gets (and keeps) its own.
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._new_http()
+            self._local.http = http
+        return http
+
+    def _new_http(self):
+        """A new authorized HTTP transport for the current credentials."""
+        import httplib2
+        import google_auth_httplib2
+        return google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
 
     # --- Course & Data Fetching Methods ---
 
@@ -179,29 +515,37 @@ class ClassroomBuddyCLI:
         """Fetch available Google Classroom courses."""
         try:
             results = self.classroom_service.courses().list(
-                pageSize=100, courseStates=['ACTIVE']
-            ).execute()
+                pageSize=100, courseStates=['ACTIVE'], fields='courses(id,name)'
+            ).execute(num_retries=API_NUM_RETRIES)
             return results.get('courses', [])
         except HttpError as e:
             console.print(f"[red]⚠️ Error fetching courses:[/red] {e}")
             return []
 
-    def get_new_materials(self, course_id, since_hours):
+    def _list_materials_request(self, course_id, page_token=None):
+        """Build (but don't execute) a request for one page of a course's materials."""
+        return self.classroom_service.courses().courseWorkMaterials().list(
+            courseId=course_id,
+            pageSize=20,
+            pageToken=page_token,
+            orderBy='updateTime desc',
+            fields=MATERIAL_LIST_FIELDS
+        )
+
+    def get_new_materials(self, course_id, since_hours, first_page: Optional[Dict] = None):
         """
         Fetch new courseWorkMaterial items (lectures, readings, etc.)
+        `first_page` is an already-fetched first response (see get_new_materials_batch).
         """
         try:
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=since_hours)
             
             materials = []
             page_token = None
+            response = first_page
             while True:
-                response = self.classroom_service.courses().courseWorkMaterials().list(
-                    courseId=course_id,
-                    pageSize=20,
-                    pageToken=page_token,
-                    orderBy='updateTime desc'
-                ).execute()
+                if response is None:
+                    response = self._list_materials_request(course_id, page_token).execute(num_retries=API_NUM_RETRIES)
                 
                 items = response.get('courseWorkMaterial', [])
                 
@@ -216,74 +560,187 @@ class ClassroomBuddyCLI:
                 page_token = response.get('nextPageToken')
                 if not page_token or not items:
                     break
+                response = None
                     
             return materials
         except HttpError as e:
             console.print(f"[red]⚠️ Error fetching materials for course {course_id}:[/red] {e}")
             return []
 
-    def get_announcements(self, course_id, max_results=10, since_hours=None):
-        """Retrieve course announcements."""
+    def get_new_materials_batch(self, course_ids: List[str], since_hours) -> Dict[str, List[Dict]]:
+        """
+        get_new_materials for several courses, fetching every course's first page
+        in one batched request. Returns {course_id: materials}.
+        """
+        try:
+            first_pages = self._execute_batch(
+                self.classroom_service,
+                {course_id: self._list_materials_request(course_id) for course_id in course_ids}
+            )
+        except HttpError as e:
+            console.print(f"[red]⚠️ Error fetching materials:[/red] {e}")
+            first_pages = {}
+        # Courses whose batched request failed are retried individually
+        return {
+            course_id: self.get_new_materials(course_id, since_hours, first_page=first_pages.get(course_id))
+            for course_id in course_ids
+        }
+
+    def _list_announcements_request(self, course_id, max_results, page_token=None):
+        """
+        Build (but don't execute) a request for one page of a course's announcements.
+        With `max_results=None` pages are as large as the API allows.
+        """
+        return self.classroom_service.courses().announcements().list(
+            courseId=course_id,
+            pageSize=min(max_results or 100, 100),
+            pageToken=page_token,
+            orderBy='updateTime desc',
+            fields=ANNOUNCEMENT_LIST_FIELDS
+        )
+
+    def get_announcements(self, course_id, max_results=10, since_hours=None, first_page: Optional[Dict] = None,
+                          after: Optional[str] = None):
+        """
+        Retrieve course announcements.
+        `first_page` is an already-fetched first response (see get_announcements_batch).
+        `after` is an updateTime; only announcements updated later are returned, and
+        all of them, ignoring `max_results`, so none are skipped between --new-only runs.
+        """
+        if after:
+            max_results = None
         try:
             announcements, page_token = [], None
             cutoff_time = None
             if since_hours:
                 # Use timezone-aware cutoff
                 cutoff_time = datetime.now(timezone.utc) - timedelta(hours=since_hours)
+            # The watermark is compared at full precision; _parse_timestamp drops
+            # fractions of a second, which would hide edits made within the same second
+            after_key = self._timestamp_key(after) if after else None
                 
+            response = first_page
             while True:
-                response = self.classroom_service.courses().announcements().list(
-                    courseId=course_id,
-                    pageSize=min(max_results, 100),
-                    pageToken=page_token,
-                    orderBy='updateTime desc'
-                ).execute()
+                if response is None:
+                    response = self._list_announcements_request(course_id, max_results, page_token).execute(num_retries=API_NUM_RETRIES)
 
                 items = response.get('announcements', [])
                 
                 if not items:
                     break
 
-                if since_hours:
+                reached_cutoff = False
+                if cutoff_time or after_key:
                     filtered_items = []
                     for i in items:
                         # Use the robust, timezone-aware parser
-                        update_time = self._parse_timestamp(i.get('updateTime'))
-                        if update_time > cutoff_time:
+                        is_recent = not cutoff_time or self._parse_timestamp(i.get('updateTime')) > cutoff_time
+                        is_unseen = not after_key or self._timestamp_key(i.get('updateTime')) > after_key
+                        if is_recent and is_unseen:
                             filtered_items.append(i)
                         else:
                             # Since announcements are sorted by updateTime desc,
-                            # we can stop once we hit an old one.
-                            items = filtered_items # Use only the items we found
-                            page_token = None # Force stop paging
+                            # every later item and page is older too.
+                            reached_cutoff = True
                             break
                     items = filtered_items
                 
                 announcements.extend(items)
                 page_token = response.get('nextPageToken')
                 
-                if not page_token or len(announcements) >= max_results:
+                if reached_cutoff or not page_token or (max_results and len(announcements) >= max_results):
                     break
+                response = None
 
             return announcements[:max_results]
         except HttpError as e:
             console.print(f"[red]⚠️ Error fetching announcements:[/red] {e}")
             return []
 
+    def get_announcements_batch(self, course_ids: List[str], max_results=10, since_hours=None,
+                                after: Optional[Dict[str, str]] = None) -> Dict[str, List[Dict]]:
+        """
+        get_announcements for several courses, fetching every course's first page
+        in one batched request. `after` maps course IDs to their `after` updateTime.
+        Returns {course_id: announcements}.
+        """
+        after = after or {}
+        try:
+            first_pages = self._execute_batch(
+                self.classroom_service,
+                {
+                    course_id: self._list_announcements_request(course_id, None if after.get(course_id) else max_results)
+                    for course_id in course_ids
+                }
+            )
+        except HttpError as e:
+            console.print(f"[red]⚠️ Error fetching announcements:[/red] {e}")
+            first_pages = {}
+        # Courses whose batched request failed are retried individually
+        return {
+            course_id: self.get_announcements(course_id, max_results, since_hours, first_page=first_pages.get(course_id),
+                                              after=after.get(course_id))
+            for course_id in course_ids
+        }
+
+    def load_announcement_watermarks(self) -> Dict[str, str]:
+        """Newest announcement updateTime seen per course by earlier --new-only runs."""
+        try:
+            with open(ANNOUNCEMENT_WATERMARKS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_announcement_watermarks(self, watermarks: Dict[str, str]):
+        """Persist the watermarks returned by load_announcement_watermarks, after updating them."""
+        self._write_cache(ANNOUNCEMENT_WATERMARKS_FILE, json.dumps(watermarks, indent=2))
+
     # --- Drive & File Handling Methods (from Study Buddy) ---
 
-    def get_drive_file_text(self, drive_file) -> Optional[str]:
+    def get_drive_files_metadata(self, file_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch the MIME type and name of several Drive files in one batched request.
+        Returns {file_id: metadata}; files that could not be looked up are omitted.
+        """
+        requests = {
+            file_id: self.drive_service.files().get(fileId=file_id, fields=DRIVE_METADATA_FIELDS)
+            for file_id in file_ids if file_id
+        }
+        if not requests:
+            return {}
+        try:
+            results = self._execute_batch(self.drive_service, requests)
+        except HttpError as e:
+            console.print(f"  [red]Error fetching Drive file metadata: {e}[/red]")
+            return {}
+        return {file_id: metadata for file_id, metadata in results.items() if metadata}
+
+    def get_drive_file_text(self, drive_file, metadata: Optional[Dict] = None) -> Optional[str]:
         """
         Downloads a Google Drive file (Doc, PDF) and extracts all text.
+        Pass `metadata` (from get_drive_files_metadata) to skip the lookup request.
+        Safe to call from worker threads.
         """
         file_id = drive_file.get('id')
         name = drive_file.get('title', 'Unknown File')
+        http = self._thread_http()
         
         # Get file metadata to check its MIME type
         try:
-            metadata = self.drive_service.files().get(fileId=file_id, fields='mimeType, name').execute()
+            if metadata is None:
+                metadata = self.drive_service.files().get(
+                    fileId=file_id, fields=DRIVE_METADATA_FIELDS
+                ).execute(http=http, num_retries=API_NUM_RETRIES)
             mime_type = metadata.get('mimeType')
             name = metadata.get('name', name)
+
+            # Reuse text extracted on a previous run if the file hasn't changed since
+            cache_path = self._text_cache_path(file_id, metadata.get('modifiedTime'))
+            if cache_path and os.path.exists(cache_path):
+                console.print(f"  > Reading file: [dim]{name}[/dim] (cached)")
+                self._touch_cache(cache_path)
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return f.read()
             
             console.print(f"  > Reading file: [dim]{name}[/dim] (Type: {mime_type})")
             
@@ -306,49 +763,112 @@ class ClassroomBuddyCLI:
                 return None
 
             # Download the file content
+            from googleapiclient.http import MediaIoBaseDownload
+            request.http = http
             fh = io.BytesIO()
             downloader = MediaIoBaseDownload(fh, request)
             done = False
             while not done:
-                status, done = downloader.next_chunk()
+                status, done = downloader.next_chunk(num_retries=API_NUM_RETRIES)
             
             fh.seek(0)
             
             # Extract text based on original type
             if 'pdf' in mime_type:
                 try:
+                    import pdfplumber
                     with pdfplumber.open(fh) as pdf:
                         full_text = "\n".join(
                             page.extract_text() for page in pdf.pages if page.extract_text()
                         )
-                        return full_text
                 except Exception as e:
                     console.print(f"  [red]Error reading PDF content: {e}[/red]")
                     return None
             else:
                 # It was exported as plain text
-                return fh.read().decode('utf-8')
+                full_text = fh.read().decode('utf-8')
+
+            if cache_path:
+                self._write_cache(cache_path, full_text)
+            return full_text
 
         except HttpError as e:
             console.print(f"  [red]Error accessing Drive file {name}: {e}[/red]")
             return None
 
+    def _text_cache_path(self, file_id: str, modified_time: Optional[str]) -> Optional[str]:
+        """Path of the cached text for one revision of a Drive file (None if unversioned)."""
+        if not file_id or not modified_time:
+            return None
+        key = hashlib.sha256(f"{file_id}:{modified_time}".encode('utf-8')).hexdigest()
+        return os.path.join(CACHE_DIR, 'text', f"{key}.txt")
+
+    def _write_cache(self, cache_path: str, content: str):
+        """Best-effort write of a cache entry; a failed write only costs recomputing it."""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Unique temp name so concurrent writers of one entry can't interleave
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_path) # Never leave a half-written entry behind
+        except OSError as e:
+            console.print(f"  [dim]Could not write cache entry: {e}[/dim]")
+
+    def _touch_cache(self, cache_path: str):
+        """Mark a cache entry as used, so pruning (see _prune_cache) keeps it."""
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _prune_cache(max_age_days: int = CACHE_MAX_AGE_DAYS):
+        """
+        Best-effort removal of cached Gemini responses and extracted texts that
+        haven't been used for `max_age_days` (reads refresh an entry's age).
+        """
+        cutoff = time.time() - max_age_days * 24 * 60 * 60
+        for subdir in ('gemini', 'text'):
+            try:
+                entries = list(os.scandir(os.path.join(CACHE_DIR, subdir)))
+            except OSError:
+                continue # Nothing cached yet
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def _media_upload(self, fh: io.BytesIO, mime_type: str) -> 'MediaIoBaseUpload':
+        """
+        Wraps an in-memory file for upload. Small files (nearly everything we generate)
+        use a single multipart request; the resumable protocol costs an extra
+        round-trip and is only worth it for large files, which then go up in large
+        chunks (execute() drives the next_chunk loop for resumable uploads).
+        """
+        from googleapiclient.http import MediaIoBaseUpload
+        resumable = fh.getbuffer().nbytes > RESUMABLE_UPLOAD_THRESHOLD
+        return MediaIoBaseUpload(
+            fh,
+            mimetype=mime_type,
+            chunksize=RESUMABLE_UPLOAD_CHUNK_SIZE if resumable else -1,
+            resumable=resumable
+        )
+
     def _upload_to_drive(self, content: str, filename: str, mime_type: str = 'text/markdown') -> Optional[str]:
         """
         Uploads the generated text content to Google Drive.
         """
         file_metadata = {'name': filename}
-        media = MediaIoBaseUpload(
-            io.BytesIO(content.encode('utf-8')),
-            mimetype=mime_type,
-            resumable=True
-        )
+        media = self._media_upload(io.BytesIO(content.encode('utf-8')), mime_type)
         try:
             file = self.drive_service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, webViewLink'
-            ).execute()
+            ).execute(http=self._thread_http(), num_retries=API_NUM_RETRIES)
             return file.get('webViewLink')
         except HttpError as e:
             console.print(f"[red]Error uploading {filename} to Drive: {e}[/red]")
@@ -360,17 +880,13 @@ class ClassroomBuddyCLI:
         """
         file_metadata = {'name': filename}
         audio_bytes_io.seek(0) # Rewind the in-memory file
-        media = MediaIoBaseUpload(
-            audio_bytes_io,
-            mimetype='audio/mpeg',
-            resumable=True
-        )
+        media = self._media_upload(audio_bytes_io, 'audio/mpeg')
         try:
             file = self.drive_service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, webViewLink'
-            ).execute()
+            ).execute(http=self._thread_http(), num_retries=API_NUM_RETRIES)
             return file.get('webViewLink')
         except HttpError as e:
             console.print(f"[red]Error uploading {filename} to Drive: {e}[/red]")
@@ -380,10 +896,11 @@ class ClassroomBuddyCLI:
 
     def _run_gemini_prompt(self, prompt: str, lecture_text: str) -> str:
         """Helper function to run a generation prompt with error handling."""
-        full_prompt = f"{prompt}\n\nLECTURE TEXT:\n---\n{lecture_text}\n---"
+        # The lecture text goes first so the audio/flashcard/quiz requests for one
+        # material share a long identical prefix, which Gemini caches implicitly.
+        full_prompt = f"LECTURE TEXT:\n---\n{lecture_text}\n---\n\n{prompt}"
         try:
-            response = self.gemini_model.generate_content(full_prompt)
-            return response.text.strip()
+            return self._generate_text(full_prompt)
         except Exception as e:
             console.print(f"[red]Error during Gemini generation: {e}[/red]")
             return "Error: Could not generate content."
@@ -404,6 +921,23 @@ class ClassroomBuddyCLI:
         """
         return self._run_gemini_prompt(prompt, text)
 
+    def create_audio_summary(self, text: str, filename: str) -> Optional[str]:
+        """
+        Narrates the lecture with gTTS and uploads the MP3 to Drive.
+        Returns the Drive link. Safe to call from worker threads.
+        """
+        from gtts import gTTS
+
+        # 1. Generate text narration
+        narration_text = self.generate_audio_narration(text)
+
+        # 2. Generate MP3 in memory
+        audio_fp = io.BytesIO()
+        gTTS(text=narration_text, lang='en').write_to_fp(audio_fp)
+
+        # 3. Upload the in-memory MP3 file
+        return self._upload_audio_to_drive(audio_fp, filename)
+
     def generate_flashcards(self, text: str) -> str:
         prompt = """
         You are a study aid generator. Based on the provided lecture text,
@@ -438,37 +972,33 @@ class ClassroomBuddyCLI:
         
     # --- Gemini Generation: Announcement Analysis (from Monitor) ---
 
-    def summarize_course_announcements(self, course_name, announcements):
-        """Summarize all announcements in a single Gemini summary."""
+    def summarize_course_announcements(self, course_name, announcements,
+                                       on_update: Optional[Callable[[str], None]] = None):
+        """
+        Summarize all announcements in a single Gemini summary.
+        Pass `on_update` to stream the response (see _generate_text).
+        """
         if not announcements:
             return "No recent announcements to summarize."
 
-        compiled_texts = []
+        compiled_texts, seen_texts = [], set()
         for ann in announcements:
-            # Use the robust parser
-            timestamp = self._parse_timestamp(ann.get('updateTime', '')).strftime("%Y-%m-%d %H:%M")
             text = ann.get('text', '').strip() or 'No content.'
+            if text in seen_texts:
+                continue # Cross-posted duplicates only add tokens; keep the newest copy
+            seen_texts.add(text)
+            # Use the robust parser
+            timestamp = self._format_timestamp(ann.get('updateTime', ''))
             compiled_texts.append(f"[{timestamp}] {text}")
 
         prompt = f"""
-You are a helpful assistant summarizing all recent announcements for a course.
-
 Course: {course_name}
 
 Announcements:
 {chr(10).join(compiled_texts)}
-
-Provide a **very short, high-level summary** in bullet points (3-5 points maximum).
-Focus *only* on the most critical information:
-- **Key deadlines**
-- **Required actions** (e.g., "Submit X," "Prepare for Y")
-- **Main topics** (e.g., "Project synopsis guidelines released")
-
-Be as brief as possible. Do not use bold text.
 """
         try:
-            response = self.gemini_model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate_text(prompt, on_update, system_instruction=ANNOUNCEMENT_SUMMARY_INSTRUCTION)
         except Exception as e:
             return f"⚠️ Error generating summary: {str(e)}"
 
@@ -480,15 +1010,9 @@ Be as brief as possible. Do not use bold text.
         project_announcements = []
         
         for ann in announcements:
-            text = ann.get('text', '').lower()
-            matched_keywords = []
-            
-            for keyword in PROJECT_KEYWORDS:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-                    matched_keywords.append(keyword)
-            
+            matched_keywords, _ = _match_keywords(ann.get('text', '').lower())
             if matched_keywords:
-                project_announcements.append((ann, list(set(matched_keywords))))
+                project_announcements.append((ann, list(matched_keywords)))
         
         return project_announcements
 
@@ -500,161 +1024,75 @@ Be as brief as possible. Do not use bold text.
         lab_test_announcements = []
         
         for ann in announcements:
-            text = ann.get('text', '').lower()
-            matched_keywords = []
-            
-            for keyword in LAB_TEST_KEYWORDS:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-                    matched_keywords.append(keyword)
-            
-            if matched_keywords:
-                # To avoid overlap, check if it's *also* a project announcement.
-                # If it has project keywords, we'll let the project detector handle it.
-                is_project = False
-                for proj_keyword in PROJECT_KEYWORDS:
-                        if re.search(r'\b' + re.escape(proj_keyword) + r'\b', text, re.IGNORECASE):
-                            is_project = True
-                            break
-                
-                # Only add if it's NOT primarily a project announcement
-                if not is_project:
-                    lab_test_announcements.append((ann, list(set(matched_keywords))))
+            project_keywords, matched_keywords = _match_keywords(ann.get('text', '').lower())
+            # To avoid overlap, skip announcements that *also* match project keywords;
+            # the project detector handles those. The lookup above is cached, so this
+            # reuses the scan detect_project_announcements already did.
+            if matched_keywords and not project_keywords:
+                lab_test_announcements.append((ann, list(matched_keywords)))
         
         return lab_test_announcements
 
-    def generate_tailored_project_ideas(self, course_name: str, announcement_text: str, keywords: List[str]) -> str:
+    def generate_tailored_project_ideas(self, course_name: str, announcement_text: str, keywords: List[str],
+                                        on_update: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate project ideas tailored to the specific announcement requirements.
+        Pass `on_update` to stream the response (see _generate_text).
         """
         prompt = f"""
-You are an expert educational advisor analyzing a project announcement and generating tailored project ideas.
-
 Course: {course_name}
 Project Announcement (Full Text):
 {announcement_text}
 
 Detected Keywords: {', '.join(keywords)}
-
-Your task:
-Be detailed but concise. Use bullet points heavily.
-
-1. CAREFULLY READ and ANALYZE the announcement to understand:
-   - Specific requirements and constraints
-   - Topics or domains mentioned
-   - Technologies or tools specified
-   - Learning objectives
-   - Deliverables expected
-   - Any deadlines or milestones
-   - Team size or collaboration requirements
-   - Evaluation criteria
-
-2. Generate 5-7 TAILORED PROJECT IDEAS that:
-   - DIRECTLY match the announcement specifications
-   - Address the stated requirements
-   - Are feasible within the given constraints
-   - Align with the course subject and level
-   - Incorporate mentioned technologies/tools
-
-3. For EACH project idea provide:
-   - **Project Title**: Clear, descriptive name
-   - **Description**: 2-3 sentences explaining the project
-   - **How it meets requirements**: Explicitly state which announcement requirements it fulfills
-   - **Key Technologies/Tools**: Specific tech stack
-   - **Implementation Steps**: 4-6 high-level steps
-   - **Expected Outcomes**: What students will learn/achieve
-   - **Complexity Level**: Beginner/Intermediate/Advanced
-
-4. RESOURCES & REFERENCES:
-   - Provide 5-8 specific resources for EACH major technology/tool mentioned
-   - Include actual GitHub repository search terms (e.g., "search GitHub for: 'student management system python django'")
-   - List relevant tutorial websites with search queries
-   - Suggest YouTube channels or specific video searches
-   - Recommend documentation links (provide exact URLs where possible)
-   - Mention similar projects on platforms like:
-     * GitHub (provide search terms)
-     * Kaggle (for data science projects)
-     * CodePen/JSFiddle (for web projects)
-     * Instructables (for hardware projects)
-
-5. EXAMPLE PROJECT LINKS & SEARCH STRATEGIES:
-   - Provide specific GitHub search queries that will find similar completed projects
-   - Format: "GitHub Search: [exact search term]"
-   - Example: "GitHub Search: 'e-commerce website react node mongodb'"
-   - Include alternative search terms for different platforms
-
-Format your response clearly with:
-- Main headers (##)
-- Subheaders (###)
-- Bullet points for lists
-- Code blocks for search terms or commands
-- Bold for emphasis
-
-Be SPECIFIC, PRACTICAL, and ensure all ideas are directly relevant to the announcement content.
 """
         
         try:
-            response = self.gemini_model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate_text(prompt, on_update, system_instruction=PROJECT_IDEAS_INSTRUCTION)
         except Exception as e:
             return f"⚠️ Error generating project ideas: {str(e)}"
 
-    def generate_practice_questions(self, course_name: str, announcement_text: str, keywords: List[str]) -> str:
+    def generate_practice_questions(self, course_name: str, announcement_text: str, keywords: List[str],
+                                    on_update: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate practice lab test questions based on the announcement.
+        Pass `on_update` to stream the response (see _generate_text).
         """
         prompt = f"""
-You are an expert Computer Science professor creating a practice test.
-
 Course: {course_name}
 Announcement (Full Text):
 {announcement_text}
 
 Detected Keywords: {', '.join(keywords)}
-
-Your task:
-Be concise and clear.
-
-1. CAREFULLY READ and ANALYZE the announcement to identify:
-   - The key topics or concepts to be tested (e.g., "Data Structures," "Algorithms," "Database Queries," "Python Basics").
-   - The format of the test (e.g., coding questions, viva, multiple choice).
-   - Any specific technologies or languages mentioned.
-
-2. Generate 5-7 TAILORED PRACTICE QUESTIONS that:
-   - DIRECTLY relate to the topics in the announcement.
-   - Are at an appropriate difficulty level for a university course.
-   - Mimic the likely format of the test (focus on coding problems if it's a "lab test").
-
-3. For EACH practice question, provide:
-   - **Question Title/Topic**: (e.g., "Array Manipulation," "SQL Join," "Binary Tree Traversal")
-   - **Problem Statement**: A clear, concise problem.
-   - **Example Input/Output**: (if applicable)
-   - **Key Concepts to Apply**: What the student needs to know to solve it.
-   - **Hint**: (Optional) A small hint to guide the student.
-
-4. Provide a "Study Guide & Resources" section:
-   - List the 3-5 most important topics to review.
-   - Provide 5-8 specific resources (documentation links, tutorials, YouTube video searches) to help students prepare for these topics.
-   - Format: "Search YouTube for: 'Data Structures in Python full course'"
-   - Format: "Read documentation: 'Python 'list' methods'"
-
-Format your response clearly using Markdown (headers, subheaders, bullet points, and code blocks for code).
-Be SPECIFIC, PRACTICAL, and ensure all questions are directly relevant to the announcement content.
 """
         
         try:
-            response = self.gemini_model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate_text(prompt, on_update, system_instruction=PRACTICE_QUESTIONS_INSTRUCTION)
         except Exception as e:
             return f"⚠️ Error generating practice questions: {str(e)}"
 
 
 # ---------------------- Helper Function (from Monitor) ----------------------
 
+@lru_cache(maxsize=1024)
+def _match_keywords(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Returns the (project, lab test) keywords found in `text`.
+    Cached because both announcement detectors scan the same texts.
+    """
+    found = frozenset(match.lower() for match in KEYWORD_PATTERN.findall(text))
+    if not found:
+        return (), ()
+    project_keywords = tuple(kw for kw in PROJECT_KEYWORDS if kw in found)
+    lab_test_keywords = tuple(kw for kw in LAB_TEST_KEYWORDS if kw in found)
+    return project_keywords, lab_test_keywords
+
+
 def _ask_to_save_md(content: str, course_name: str, file_type: str, console: Console):
     """Asks the user if they want to save content to a .md file."""
     
     # Sanitize course name for a safe filename
-    safe_course_name = re.sub(r'[^\w\-_\. ]', '_', course_name).replace(' ', '_')
+    safe_course_name = UNSAFE_FILENAME_CHARS.sub('_', course_name).replace(' ', '_')
     timestamp = datetime.now().strftime('%Y%m%d-%H%M')
     default_filename = f"{file_type}-{safe_course_name}-{timestamp}.md"
 
@@ -672,16 +1110,63 @@ def _ask_to_save_md(content: str, course_name: str, file_type: str, console: Con
         print() # Add a newline for spacing
 
 
+def _stream_to_panel(generate: Callable[[Callable[[str], None]], str], title: str, border_style: str,
+                     markdown: bool = True) -> str:
+    """
+    Renders a streamed Gemini response inside a Panel while it arrives (as Markdown
+    unless `markdown` is False). `generate` receives the on_update callback and
+    returns the final text.
+    """
+    def render(text: str) -> Panel:
+        return Panel(Markdown(text) if markdown else text, title=title, border_style=border_style, padding=(1, 2))
+
+    with Live(render(""), console=console, refresh_per_second=8) as live:
+        result = generate(lambda text: live.update(render(text)))
+        live.update(render(result)) # Final text (or error message)
+    return result
+
+
 # ---------------------- Typer Commands (Merged) ----------------------
 
+# Options shared by every command that talks to Google
+CREDENTIALS_OPTION = typer.Option("credentials.json", help="Path to credentials file.")
+TOKEN_OPTION = typer.Option("token.json", help="Path to saved token file.")
+NO_CACHE_OPTION = typer.Option(False, "--no-cache", help="Ignore cached Gemini responses and regenerate.")
+
+
+@lru_cache(maxsize=4)
+def _get_cli(credentials_file: str, token_file: str, authenticate: bool, use_cache: bool) -> ClassroomBuddyCLI:
+    """
+    Shared ClassroomBuddyCLI per configuration, so commands invoked more than once in
+    a process (e.g. from Python or tests) don't repeat sign-in and client setup.
+    Always call it with all four arguments positionally so equal configurations share
+    one cache entry.
+    """
+    return ClassroomBuddyCLI(credentials_file, token_file, authenticate, use_cache)
+
+
+def _version_callback(value: bool):
+    if value:
+        console.print(f"genie-us {__version__}")
+        raise typer.Exit()
+
+
+@app.callback()
+def main(
+    version: bool = typer.Option(False, "--version", "-V", help="Show the version and exit.",
+                                 callback=_version_callback, is_eager=True),
+):
+    ClassroomBuddyCLI._prune_cache()
+
+
 @app.command()
 def list_courses(
-    credentials: str = typer.Option("credentials.json", help="Path to credentials file."),
-    token: str = typer.Option("token.pickle", help="Path to saved token file."),
+    credentials: str = CREDENTIALS_OPTION,
+    token: str = TOKEN_OPTION,
 ):
     """List all your active Google Classroom courses."""
     console.print("📚 [bold]Fetching your courses...[/bold]\n")
-    cli = ClassroomBuddyCLI(credentials_file=credentials, token_file=token)
+    cli = _get_cli(credentials, token, True, True)
     courses = cli.get_courses()
     if not courses:
         console.print("No active courses found.")
@@ -699,20 +1184,21 @@ def detect_materials(
     course_id: str = typer.Option(None, "--course-id", help="Specific course ID to scan."),
     all_courses: bool = typer.Option(False, "--all-courses", help="Scan all available courses."),
     since: int = typer.Option(24, help="Only scan materials from last N hours."),
-    credentials: str = typer.Option("credentials.json", help="Path to credentials file"),
-    token: str = typer.Option("token.pickle", help="Path to saved token file.")
+    credentials: str = CREDENTIALS_OPTION,
+    token: str = TOKEN_OPTION,
+    no_cache: bool = NO_CACHE_OPTION
 ):
     """
     Detect new lecture materials (PDFs, Docs) and generate study aids.
     """
     console.print("🚀 [bold]Initializing Study Buddy (Material Detector)...[/bold]")
-    cli = ClassroomBuddyCLI(credentials_file=credentials, token_file=token)
+    cli = _get_cli(credentials, token, True, not no_cache)
     print()
 
     # Determine which courses to process
     if course_id:
         try:
-            course_info = cli.classroom_service.courses().get(id=course_id).execute()
+            course_info = cli.classroom_service.courses().get(id=course_id, fields='name').execute(num_retries=API_NUM_RETRIES)
             course_name = course_info.get('name', f'Course {course_id}')
             courses = [{'id': course_id, 'name': course_name}]
         except HttpError:
@@ -728,12 +1214,15 @@ def detect_materials(
         raise typer.Exit()
 
     # --- Main Processing Loop ---
+    with Status("[bold]Fetching course materials...[/bold]", console=console):
+        materials_by_course = cli.get_new_materials_batch([c['id'] for c in courses], since_hours=since)
+
     total_materials_found = 0
     for course in courses:
         course_name = course['name']
         console.rule(f"[bold blue]🔍 Scanning for Materials: {course_name}[/bold blue]")
         
-        new_materials = cli.get_new_materials(course['id'], since_hours=since)
+        new_materials = materials_by_course[course['id']]
         
         if not new_materials:
             console.print(f"[dim]No new materials found in the last {since} hours.[/dim]\n")
@@ -751,13 +1240,24 @@ def detect_materials(
                 continue
 
             # --- Text Extraction ---
+            drive_files = [
+                item['driveFile']['driveFile'] for item in material.get('materials', [])
+                if item.get('driveFile', {}).get('driveFile')
+            ]
+            # Look up every attachment's type in one round-trip instead of one per file
+            metadata = cli.get_drive_files_metadata([f.get('id') for f in drive_files])
+
+            # Download and extract all attachments in parallel
+            with ThreadPoolExecutor(max_workers=DRIVE_DOWNLOAD_WORKERS) as executor:
+                texts = list(executor.map(
+                    lambda f: cli.get_drive_file_text(f, metadata.get(f.get('id'))),
+                    drive_files
+                ))
+
             full_lecture_text = ""
-            for item in material.get('materials', []):
-                drive_file = item.get('driveFile', {}).get('driveFile')
-                if drive_file:
-                    text = cli.get_drive_file_text(drive_file)
-                    if text:
-                        full_lecture_text += f"\n\n--- (Source: {drive_file.get('title', 'N/A')}) ---\n{text}"
+            for drive_file, text in zip(drive_files, texts):
+                if text:
+                    full_lecture_text += f"\n\n--- (Source: {drive_file.get('title', 'N/A')}) ---\n{text}"
             
             if not full_lecture_text.strip():
                 console.print("[yellow]  > Could not extract any text from attachments. Skipping.[/yellow]")
@@ -770,43 +1270,33 @@ def detect_materials(
                 console.print("[dim]  > Skipping generation.[/dim]")
                 continue
 
-            base_filename = f"{re.sub(r'[^\w\-_\. ]', '', title).replace(' ', '_')}"
+            base_filename = f"{UNSAFE_FILENAME_CHARS.sub('', title).replace(' ', '_')}"
             
-            # Audio Summary (MP3)
+            # Ask about every aid first so the selected ones can be produced together
+            aids = []
             if typer.confirm("  1. Generate an Audio Summary (MP3)?"):
-                with Status("[bold magenta]Generating audio summary...[/bold magenta]", console=console):
-                    try:
-                        # 1. Generate text narration
-                        narration_text = cli.generate_audio_narration(full_lecture_text)
-                        
-                        # 2. Generate MP3 in memory
-                        audio_fp = io.BytesIO()
-                        tts = gTTS(text=narration_text, lang='en')
-                        tts.write_to_fp(audio_fp)
-                        
-                        # 3. Upload the in-memory MP3 file
-                        filename = f"Summary-{base_filename}.mp3"
-                        link = cli._upload_audio_to_drive(audio_fp, filename)
-                        
-                        console.print(f"  [green]✓ Audio Summary generated![/green] [dim]({link})[/dim]")
-                    except Exception as e:
-                        console.print(f"  [red]Error generating audio: {e}[/red]")
-                    
-            # Flashcards
+                aids.append(("Audio Summary", lambda: cli.create_audio_summary(
+                    full_lecture_text, f"Summary-{base_filename}.mp3")))
             if typer.confirm("  2. Generate Flashcards?"):
-                with Status("[bold magenta]Generating flashcards...[/bold magenta]", console=console):
-                    content = cli.generate_flashcards(full_lecture_text)
-                    filename = f"Flashcards-{base_filename}.csv"
-                    link = cli._upload_to_drive(content, filename, mime_type='text/csv')
-                console.print(f"  [green]✓ Flashcards generated![/green] [dim]({link})[/dim]")
-
-            # Quiz
+                aids.append(("Flashcards", lambda: cli._upload_to_drive(
+                    cli.generate_flashcards(full_lecture_text), f"Flashcards-{base_filename}.csv",
+                    mime_type='text/csv')))
             if typer.confirm("  3. Generate a Quiz?"):
-                with Status("[bold magenta]Generating quiz...[/bold magenta]", console=console):
-                    content = cli.generate_quiz(full_lecture_text)
-                    filename = f"Quiz-{base_filename}.md"
-                    link = cli._upload_to_drive(content, filename)
-                console.print(f"  [green]✓ Quiz generated![/green] [dim]({link})[/dim]")
+                aids.append(("Quiz", lambda: cli._upload_to_drive(
+                    cli.generate_quiz(full_lecture_text), f"Quiz-{base_filename}.md")))
+
+            # Each aid is an independent chain of Gemini/gTTS/Drive round-trips, so run
+            # them concurrently and report results in the order they were chosen
+            if aids:
+                with Status("[bold magenta]Generating study aids...[/bold magenta]", console=console), \
+                        ThreadPoolExecutor(max_workers=len(aids)) as executor:
+                    futures = [(label, executor.submit(job)) for label, job in aids]
+                    for label, future in futures:
+                        try:
+                            link = future.result()
+                            console.print(f"  [green]✓ {label} generated![/green] [dim]({link})[/dim]")
+                        except Exception as e:
+                            console.print(f"  [red]Error generating {label.lower()}: {e}[/red]")
 
             console.print(f"\n[bold green]✅ Done processing '{title}'![/bold green]")
             
@@ -824,18 +1314,20 @@ def summarize_announcements(
     max_announcements: int = typer.Option(10, "--max", help="Max announcements per course."),
     since: int = typer.Option(None, help="Only include announcements from last N hours."),
     no_summary: bool = typer.Option(False, help="Disable AI summarization, just list."),
-    credentials: str = typer.Option("credentials.json", help="Path to credentials file"),
-    token: str = typer.Option("token.pickle", help="Path to saved token file.")
+    new_only: bool = typer.Option(False, "--new-only", help="Only include announcements posted or updated since the last --new-only run (all of them, ignoring --max)."),
+    credentials: str = CREDENTIALS_OPTION,
+    token: str = TOKEN_OPTION,
+    no_cache: bool = NO_CACHE_OPTION
 ):
     """Fetch and summarize all announcements for each course."""
     console.print("🚀 [bold]Initializing Google Classroom Summarizer...[/bold]")
-    cli = ClassroomBuddyCLI(credentials_file=credentials, token_file=token)
+    cli = _get_cli(credentials, token, True, not no_cache)
     print()
 
     # Determine which courses to process
     if course_id:
         try:
-            course_info = cli.classroom_service.courses().get(id=course_id).execute()
+            course_info = cli.classroom_service.courses().get(id=course_id, fields='name').execute(num_retries=API_NUM_RETRIES)
             course_name = course_info.get('name', f'Course {course_id}')
         except HttpError:
             course_name = f'Course {course_id}'
@@ -849,38 +1341,72 @@ def summarize_announcements(
         console.print("[yellow]❗ Please specify either --course-id or --all-courses.[/yellow]")
         raise typer.Exit()
 
+    watermarks = cli.load_announcement_watermarks() if new_only else {}
+    with Status("[bold]Fetching announcements...[/bold]", console=console):
+        anns_by_course = cli.get_announcements_batch(
+            [c['id'] for c in courses], max_results=max_announcements, since_hours=since, after=watermarks
+        )
+
     total = 0
-    for course in courses:
-        console.rule(f"[bold blue]🔍 Summarizing: {course['name']} (ID: {course['id']})[/bold blue]")
-        anns = cli.get_announcements(course['id'], max_results=max_announcements, since_hours=since)
+    # With several courses to summarize, start every summary up front so the Gemini
+    # round-trips overlap; results are still shown course by course below. A single
+    # summary is streamed instead, so it appears as it is generated.
+    to_summarize = [] if no_summary else [c for c in courses if anns_by_course[c['id']]]
+    with ThreadPoolExecutor(max_workers=GEMINI_MAX_CONCURRENCY) as executor:
+        summary_futures = {} if len(to_summarize) < 2 else {
+            c['id']: executor.submit(cli.summarize_course_announcements, c['name'], anns_by_course[c['id']])
+            for c in to_summarize
+        }
+
+        for course in courses:
+            console.rule(f"[bold blue]🔍 Summarizing: {course['name']} (ID: {course['id']})[/bold blue]")
+            anns = anns_by_course[course['id']]
         
-        if not anns:
-            msg = "No announcements d"
-            if since:
-                msg += f" in the last {since} hours"
-            console.print(f"[dim]{msg} in this course.[/dim]\n")
-            continue
+            if not anns:
+                msg = "No announcements d"
+                if since:
+                    msg += f" in the last {since} hours"
+                console.print(f"[dim]{msg} in this course.[/dim]\n")
+                continue
 
-        total += len(anns)
-        console.print(f"📢 Found [green]{len(anns)}[/green] announcement(s):\n")
-        for i, ann in enumerate(anns, start=1):
-            timestamp = cli._parse_timestamp(ann.get('updateTime')).strftime("%Y-%m-%d %H:%M")
-            text = ann.get('text', 'No content').strip().split('\n')[0] # Show first line
-            console.print(f"{i}. [{timestamp}] {text[:100]}...") # Truncate long lines
-
-        if not no_summary:
-            console.print("\n🤖 [cyan]Generating overall course summary...[/cyan]\n")
-            summary = cli.summarize_course_announcements(course['name'], anns)
-            console.print(Panel(
-                summary,
-                title=f"[bold white]📘 COURSE SUMMARY: {course['name']}[/bold white]",
-                border_style="blue",
-                padding=(1, 2)
-            ))
-        # Ask to save the summary
-            _ask_to_save_md(summary, course['name'], "summary", console)
+            total += len(anns)
+            console.print(f"📢 Found [green]{len(anns)}[/green] announcement(s):\n")
+            lines = []
+            for i, ann in enumerate(anns, start=1):
+                timestamp = cli._format_timestamp(ann.get('updateTime'))
+                text = ann.get('text', 'No content').strip().partition('\n')[0] # Show first line
+                lines.append(f"{i}. [{timestamp}] {text[:100]}...") # Truncate long lines
+            console.print("\n".join(lines)) # One write for the whole listing
+
+            if not no_summary:
+                console.print("\n🤖 [cyan]Generating overall course summary...[/cyan]\n")
+                title = f"[bold white]📘 COURSE SUMMARY: {course['name']}[/bold white]"
+                if course['id'] in summary_futures:
+                    summary = summary_futures[course['id']].result()
+                    console.print(Panel(
+                        summary,
+                        title=title,
+                        border_style="blue",
+                        padding=(1, 2)
+                    ))
+                else:
+                    summary = _stream_to_panel(
+                        lambda on_update: cli.summarize_course_announcements(course['name'], anns, on_update),
+                        title=title,
+                        border_style="blue",
+                        markdown=False
+                    )
+            # Ask to save the summary
+                _ask_to_save_md(summary, course['name'], "summary", console)
             
-        print()
+            print()
+
+    if new_only:
+        # Announcements come newest first, so the first one is the new watermark
+        for c in courses:
+            if anns_by_course[c['id']]:
+                watermarks[c['id']] = anns_by_course[c['id']][0].get('updateTime')
+        cli.save_announcement_watermarks(watermarks)
 
     console.rule("[bold]Summary Complete[/bold]")
     console.print(f"✅ Processed [bold]{total}[/bold] announcements across [bold]{len(courses)}[/bold] course(s).\n")
@@ -890,25 +1416,26 @@ def summarize_announcements(
 @app.command("detect-announcements")
 def detect_announcements(
     course_id: str = typer.Option(None, "--course-id", help="Specific course ID to scan."),
-    allourses: bool = typer.Option(False, "--all-courses", help="Scan all available courses."),
+    all_courses: bool = typer.Option(False, "--all-courses", help="Scan all available courses."),
     max_announcements: int = typer.Option(20, "--max", help="Max announcements to scan per course."),
     since: int = typer.Option(None, help="Only scan announcements from last N hours."),
     keywords_only: bool = typer.Option(False, help="Only show detected keywords without generating ideas."),
-    credentials: str = typer.Option("credentials.json", help="Path to credentials file"),
-    token: str = typer.Option("token.pickle", help="Path to saved token file.")
+    credentials: str = CREDENTIALS_OPTION,
+    token: str = TOKEN_OPTION,
+    no_cache: bool = NO_CACHE_OPTION
 ):
     """
     Detect project/lab test announcements and generate tailored ideas/questions.
     """
     console.print("🚀 [bold]Initializing Google Classroom Project Detector...[/bold]")
-    cli = ClassroomBuddyCLI(credentials_file=credentials, token_file=token)
+    cli = _get_cli(credentials, token, True, not no_cache)
     print()
 
     # Determine which courses to process
     if course_id:
         try:
-            course_info = cli.classroom_service.courses().get(id=course_id).execute()
-            course_name = cour_info.get('name', f'Course {course_id}')
+            course_info = cli.classroom_service.courses().get(id=course_id, fields='name').execute(num_retries=API_NUM_RETRIES)
+            course_name = course_info.get('name', f'Course {course_id}')
         except HttpError:
             course_name = f'Course {course_id}'
         courses = [{'id': course_id, 'name': course_name}]
@@ -924,10 +1451,15 @@ def detect_announcements(
     total_announcements = 0
     total_projects_detected = 0
     total_lab_tests_detected = 0
+
+    with Status("[bold]Fetching announcements...[/bold]", console=console):
+        anns_by_course = cli.get_announcements_batch(
+            [c['id'] for c in courses], max_results=max_announcements, since_hours=since
+        )
     
     for course in courses:
         console.rule(f"[bold blue]🔍 Scanning for Announcements: {course['name']}[/bold blue]")
-        anns = cli.get_announcements(course['id'], max_results=max_announcements, since_hours=since)
+        anns = anns_by_course[course['id']]
         
         if not anns:
             msg = "No announcements found"
@@ -949,86 +1481,94 @@ def detect_announcements(
             console.print("[dim]✗ No project or lab test announcem detected in this course.[/dim]\n")
             continue
         
-        # --- Process Project Announcements ---
-        if project_anns:
-            total_projects_detected += len(project_anns)
-            console.print(f"🎯 [bold green]Found {len(project_anns)} project-related announcement(s)![/bold green]\n")
+        # Dispatch every Gemini request for this course up front so the
+        # round-trips overlap; results are consumed in order below.
+        with ThreadPoolExecutor(max_workers=GEMINI_MAX_CONCURRENCY) as executor:
+            project_futures, lab_test_futures = [], []
+            if not keywords_only:
+                project_futures = [
+                    executor.submit(cli.generate_tailored_project_ideas, course['name'],
+                                    ann.get('text', 'No content').strip(), keywords)
+                    for ann, keywords in project_anns
+                ]
+                lab_test_futures = [
+                    executor.submit(cli.generate_practice_questions, course['name'],
+                                    ann.get('text', 'No content').strip(), keywords)
+                    for ann, keywords in lab_test_anns
+                ]
+
+            # --- Process Project Announcements ---
+            if project_anns:
+                total_projects_detected += len(project_anns)
+                console.print(f"🎯 [bold green]Found {len(project_anns)} project-related announcement(s)![/bold green]\n")
             
-            for idx, (ann, keywords) in enumerate(project_anns, start=1):
-                timestamp = cli._parse_timestamp(ann.get('updateTime')).strftime("%Y-%m-%d %H:%M")
-                text = ann.get('text', 'No content').strip()
+                for idx, (ann, keywords) in enumerate(project_anns, start=1):
+                    timestamp = cli._format_timestamp(ann.get('updateTime'))
+                    text = ann.get('text', 'No content').strip()
                 
-                console.print(Panel(
-                    f"[bold yellow]📅 Posted:[/bold yellow] {timestamp}\n\n"
-                    f"[bold yellow]🔑 Detected Keywords:[/bold yellow] {', '.join(keywords)}\n\n"
-                    f"[bold yellow]📝 Full Announcement:[/bold yellow]\n{text}",
-                    title=f"[bold cyan]Project Announcement #{idx} - {course['name']}[/bold cyan]",
-                    border_style="cyan",
-              padding=(1, 2)
-                ))
+                    console.print(Panel(
+                        f"[bold yellow]📅 Posted:[/bold yellow] {timestamp}\n\n"
+                        f"[bold yellow]🔑 Detected Keywords:[/bold yellow] {', '.join(keywords)}\n\n"
+                        f"[bold yellow]📝 Full Announcement:[/bold yellow]\n{text}",
+                        title=f"[bold cyan]Project Announcement #{idx} - {course['name']}[/bold cyan]",
+                        border_style="cyan",
+                  padding=(1, 2)
+                    ))
                 
-                if keywords_only:
-                    console.print()
-                    continue
+                    if keywords_only:
+                        console.print()
+                        continue
                 
-                console.print("\n💡 [bold magenta]Analyzing announcement and generating tailored project ideas...[/bold magenta]\n")
+                    console.print("\n💡 [bold magenta]Analyzing announcement and generating tailored project ideas...[/bold magenta]\n")
                 
-                project_ideas = cli.generate_tailored_project_ideas(
-                    course['name'], 
-                    text, 
-                    keywords
-                )
+                    project_ideas = project_futures[idx - 1].result()
               
-                console.print(Panel(
-                    Markdown(project_ideas),
-                    title=f"[bold green]🚀 Tailored Project Ideas & Resources[/bold green]",
-                    border_style="green",
-                    padding=(1, 2)
-                ))
+                    console.print(Panel(
+                        Markdown(project_ideas),
+                        title=f"[bold green]🚀 Tailored Project Ideas & Resources[/bold green]",
+                        border_style="green",
+                        padding=(1, 2)
+                    ))
                 
-                # Ask to save the project ideas
-                _ask_to_save_md(project_ideas, course['name'], f"project-ideas-{idx}", console)
+                    # Ask to save the project ideas
+                    _ask_to_save_md(project_ideas, course['name'], f"project-ideas-{idx}", console)
                 
-                console.print("\n" + "="*80 + "\n")
-        # --- Process Lab Test Announcements ---
-        if lab_test_anns:
-            total_lab_tests_detected += len(lab_test_anns)
-            console.print(f"🧪 [bold yellow]Found {len(lab_test_anns)} lab test/evaluation announcement(s)![/bold yellow]\n")
+                    console.print(SECTION_SEPARATOR)
+            # --- Process Lab Test Announcements ---
+            if lab_test_anns:
+                total_lab_tests_detected += len(lab_test_anns)
+                console.print(f"🧪 [bold yellow]Found {len(lab_test_anns)} lab test/evaluation announcement(s)![/bold yellow]\n")
             
-            for idx, (ann, keywords) in enumerate(lab_test_anns, start=1):
-                timestamp = cli._parse_timestamp(ann.get('updateTime')).strftime("%Y-%m-%d %H:%M")
-                text = ann.get('text', 'No content').strip()
+                for idx, (ann, keywords) in enumerate(lab_test_anns, start=1):
+                    timestamp = cli._format_timestamp(ann.get('updateTime'))
+                    text = ann.get('text', 'No content').strip()
               
-                console.print(Panel(
-                    f"[bold yellow]📅 Posted:[/bold yellow] {timestamp}\n\n"
-                    f"[bold yellow]🔑 Detected Keywords:[/bold yellow] {', '.join(keywords)}\n\n"
-                    f"[bold yellow]📝 Full Announcement:[/bold yellow]\n{text}",
-                    title=f"[bold magenta]Lab Test Announcement #{idx} - {course['name']}[/bold magenta]",
-                    border_style="magenta",
-                    padding=(1, 2)))
+                    console.print(Panel(
+                        f"[bold yellow]📅 Posted:[/bold yellow] {timestamp}\n\n"
+                        f"[bold yellow]🔑 Detected Keywords:[/bold yellow] {', '.join(keywords)}\n\n"
+                        f"[bold yellow]📝 Full Announcement:[/bold yellow]\n{text}",
+                        title=f"[bold magenta]Lab Test Announcement #{idx} - {course['name']}[/bold magenta]",
+                        border_style="magenta",
+                        padding=(1, 2)))
                              
-                if keywords_only:
-                    console.print()
-                    continue
+                    if keywords_only:
+                        console.print()
+                        continue
                     
-                console.print("\n💡 [bold cyan]Analyzing announcement and generating practice questions...[/bold cyan]\n")
+                    console.print("\n💡 [bold cyan]Analyzing announcement and generating practice questions...[/bold cyan]\n")
                 
-                practice_questions = cli.generate_practice_questions(
-                    course['name'], 
-                    text, 
-                    keywords
-                )
+                    practice_questions = lab_test_futures[idx - 1].result()
                 
-                console.print(Panel(Markdown(practice_questions),
-                    title=f"[bold blue]📚 Practice Questions & Study Guide[/bold blue]",
-                    border_style="blue",
-                    padding=(1, 2)
-                ))
+                    console.print(Panel(Markdown(practice_questions),
+                        title=f"[bold blue]📚 Practice Questions & Study Guide[/bold blue]",
+                        border_style="blue",
+                        padding=(1, 2)
+                    ))
                 
-                # Ask to save the practice questions
-                _ask_to_save_md(practice_questions, course['name'], f"practice-questions-{idx}", console)
+                    # Ask to save the practice questions
+                    _ask_to_save_md(practice_questions, course['name'], f"practice-questions-{idx}", console)
                 
-                console.print("\n" + "="*80 + "\n")
+                    console.print(SECTION_SEPARATOR)
 
     # Summary
     console.rule("[bold]Announcement Detection Complete[/bold]")
@@ -1047,28 +1587,20 @@ def detect_announcements(
 def analyze_announcement(
     announcement_text: str = typer.Argument(..., help="Project announcement text to analyze"),
     course_name: str = typer.Option("General", help="Course name for context"),
-    credentials: str = typer.Option("credentials.json", help="Path to credentia file."),
-    token: str = typer.Option("token.pickle", help="Path to saved token file.")
+    no_cache: bool = NO_CACHE_OPTION,
+    # Deprecated: accepted so existing scripts keep working, but ignored (no Google sign-in here)
+    credentials: Optional[str] = typer.Option(None, hidden=True, help="Deprecated and ignored."),
+    token: Optional[str] = typer.Option(None, hidden=True, help="Deprecated and ignored."),
 ):
     """
     Analyze specific announcement text and generate tailored project/lab ideas.
     """
+    if credentials is not None or token is not None:
+        console.print("[dim]Note: --credentials/--token are deprecated and ignored by analyze-announcement.[/dim]")
     console.print(f"🔍 [bold]Analyzing announcement text for: {course_name}[/bold]\n")
-    # Authentication is needed just to set up the Gemini model
-    cli = ClassroomBuddyCLI(credentials_file=credentials, token_file=token)
-    
-    # Detect project keywords
-    project_keywords = []
-    text_lower = announcement_textower()
-    for keyword in PROJECT_KEYWORDS:
-        if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower, re.IGNORECASE):
-            project_keywords.append(keyword)
     
-    # Detect lab test keywords
-    lab_test_keywords = []
-    for keyword in LAB_TEST_KEYWORDS:
-        if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower, re.IGNORECASE):
-            lab_test_keywords.append(keyword)
+    # Detect project and lab test keywords
+    project_keywords, lab_test_keywords = map(list, _match_keywords(announcement_text.lower()))
 
     if not project_keywords and not lab_test_keywords:
         console.print("[yellow]⚠️ No project ob test keywords detected in the provided text.[/yellow]")
@@ -1076,6 +1608,9 @@ def analyze_announcement(
         console.print(f"[dim]Lab Test keywords: {', '.join(LAB_TEST_KEYWORDS[:5])}...[/dim]\n")
         return
 
+    # Only Gemini is needed here, so skip Google sign-in and service construction
+    cli = _get_cli('credentials.json', 'token.json', False, not no_cache)
+
     # Prioritize Projects: If project keywords are present, run project analysis
     if project_keywords:
         console.print(Panel(
@@ -1088,18 +1623,16 @@ def analyze_announcement(
         
         console.print("\n💡 [bold magenta]Generating tailored project ideas...[/bold magenta]\n")
         
-        project_ideas = cli.generate_tailored_project_ideas(
-            course_name, 
-            announcement_text, 
-            project_keywords
-        )
-        
-        console.print(Panel(
-            Markdown(project_ideas),
+        project_ideas = _stream_to_panel(
+            lambda on_update: cli.generate_tailored_project_ideas(
+                course_name, 
+                announcement_text, 
+                project_keywords,
+                on_update=on_update
+            ),
             title=f"[bold green]🚀 Tailored Project Ideas & Resources[/bold green]",
-            border_style="green",
-            padding=(1, 2)
-        ))
+            border_style="green"
+        )
         
         # Ask to save the project ideas
         _ask_to_save_md(project_ideas, course_name, "project-ideas-manual", console)
@@ -1116,18 +1649,16 @@ def analyze_announcement(
         
         console.print("\n💡 [bold cyan]Analyzing announcement and generating practice questions...[/bold cyan]\n")
         
-        practice_questions = cli.generate_practice_questions(
-            course_name, 
-            announcement_text, 
-            lab_test_keywords
-        )
-        
-        console.print(Panel(
-            Markdown(practice_questions),
+        practice_questions = _stream_to_panel(
+            lambda on_update: cli.generate_practice_questions(
+                course_name, 
+                announcement_text, 
+                lab_test_keywords,
+                on_update=on_update
+            ),
             title=f"[bold blue]📚 Practice Questions & Study Guide[/bold blue]",
-            border_style="blue",
-            padding=(1, 2)
-        ))
+            border_style="blue"
+        )
         
         # Ask to save the practice questions
         _ask_to_save_md(practice_questions, course_name, "practice-questions-manual", console)
@@ -1151,7 +1682,12 @@ def generate_doc(
     """
     console.print("📄 [bold]Initializing Code-to-Docx Generator...[/bold]")
 
-    if not DOCX_AVAILABLE:
+    # Imported here so the other commands don't pay for loading python-docx
+    try:
+        from docx import Document
+        from docx.shared import Pt
+        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    except ImportError:
         console.print("[red]Error: `python-docx` is not installed.[/red]")
         console.print("[yellow]Please install it by running: pip install python-docx[/yellow]")
         raise typer.Exit()
@@ -1193,8 +1729,10 @@ def generate_doc(
 
                 # Add the code content to the document
                 try:
-                    with open(file_path, "r", encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
+                    # One binary read + one decode instead of text-mode buffered reads
+                    # (normalise CRLF ourselves, python-docx turns each '\r' into a line break)
+                    with open(file_path, "rb") as f:
+                        content = f.read().decode('utf-8', errors='ignore').replace('\r\n', '\n')
 
                     para = doc.add_paragraph()
                     run = para.add_run(content)